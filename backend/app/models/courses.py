@@ -199,6 +199,38 @@ class CourseTable:
 
             return CourseModel.model_validate(result)
 
+    def update_bulk_courses(self, courses: List[Dict[str, Any]]) -> List[CourseModel]:
+        """
+        Update existing courses in a single transaction.
+
+        Args:
+            courses: Course dicts in the same shape insert_bulk_courses accepts
+
+        Returns:
+            List of updated CourseModel objects; courses not in the DB are skipped
+        """
+        courses_by_id = {course["course_id"]: course for course in courses}
+        if not courses_by_id:
+            return []
+
+        with get_db() as db:
+            results = (
+                db.query(Course).filter(Course.course_id.in_(list(courses_by_id))).all()
+            )
+
+            updated_at = int(time.time())
+            for result in results:
+                course_data = courses_by_id[result.course_id]
+                # Same rules as update_course: None leaves a field unchanged
+                for field in ("name", "url", "start_date", "end_date"):
+                    if course_data.get(field) is not None:
+                        setattr(result, field, course_data[field])
+                result.updated_at = updated_at
+
+            db.commit()
+
+            return [CourseModel.model_validate(r) for r in results]
+
     def get_course_count(self, status: Optional[str] = None) -> int:
         """
         Get total count of courses, optionally filtered by status.
@@ -8,6 +8,7 @@ from datetime import datetime
 from io import BytesIO
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
 
 import pandas as pd
 from app.config import (
@@ -16,6 +17,7 @@ from app.config import (
     NETACAD_INSTRUCTOR_ID,
     NETACAD_INSTRUCTOR_PASSWORD,
 )
+from app.utils.playwright_config import block_heavy_resources
 from httpx import delete
 from playwright.async_api import Page
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
@@ -32,6 +34,44 @@ GRADEBOOK_DIR.mkdir(parents=True, exist_ok=True)
 GRADEBOOK_CSV_DIR.mkdir(parents=True, exist_ok=True)
 GRADEBOOK_MD_DIR.mkdir(parents=True, exist_ok=True)
 
+# Whitespace around commas in NetAcad's padded CSV exports
+COMMA_WHITESPACE_PATTERN = re.compile(r"\s*,\s*")
+
+# Finds the export modal's OK/Close/X control and clicks it in one round-trip;
+# returns false when no such control is rendered
+CLOSE_EXPORT_MODAL_JS = """() => {
+    const modal = document.querySelector('.exportCsvModal--XL37A');
+    if (!modal) return false;
+    const target =
+        [...modal.querySelectorAll('button')].find(
+            (b) => /\\b(ok|okay|close)\\b/i.test(b.textContent)
+        ) ||
+        modal.querySelector(
+            "button.btn-primary, button.close, [aria-label='Close'], .modal-header button"
+        );
+    if (!target) return false;
+    target.click();
+    return true;
+}"""
+
+# Truthy (the link count) once the export menu is open and lists its exports
+EXPORT_MENU_READY_JS = """() => document.querySelectorAll(
+    '.dropdown__menu.dropdown-menu.show .dropdown-item.dropdownItem--gyPVf'
+).length"""
+
+
+def _is_export_list_response(response) -> bool:
+    """
+    Matches the request the export list is reloaded through.
+
+    Only XHR/fetch responses with "export" in the URL path count, so analytics,
+    telemetry or polling traffic on the page can't satisfy the wait early.
+    """
+    return (
+        response.request.resource_type in ("xhr", "fetch")
+        and "export" in urlparse(response.url).path.lower()
+    )
+
 
 class GradebookManager:
     """
@@ -46,11 +86,33 @@ class GradebookManager:
     _page: Optional[Page] = None
     _is_logged_in: bool = False
 
-    def __new__(cls, page: Page, headless: bool = True):
+    # Page selectors shared by the login, navigation and export steps
+    _LOGIN_BUTTON = ".loginBtn--lfDa2"
+    _COURSE_ANCHOR = ".instance_name--dioD1"
+    _GRADEBOOK_TAB = "#Launch-tab-gradebook"
+    _USERNAME_FIELD = "#username"
+    _PASSWORD_FIELD = "#password"
+    _EXPORT_DROPDOWN = "button.iconDownload--RKrnV"
+    _EXPORT_ALL_BUTTON = ".dropdownButton--whS7t"
+    _REFRESH_EXPORTS_BUTTON = "#refreshExportList"
+    _EXPORT_LIST_BUTTON = "#dropdown-basic"
+    _EXPORT_LINK = ".dropdown-item.dropdownItem--gyPVf"
+    _EXPORT_MODAL_SHOWN = ".exportCsvModal--XL37A.modal.show"
+
+    def __new__(cls, page: Page, headless: bool = True, singleton: bool = True):
         """
         Ensure only one instance exists per page.
         If page changes, create new instance.
+
+        With singleton=False a standalone instance is returned that tracks its
+        own login state and leaves the shared instance untouched.
         """
+        if not singleton:
+            instance = super(GradebookManager, cls).__new__(cls)
+            # Instance attribute shadows the class-level login state
+            instance._is_logged_in = False
+            return instance
+
         # If no instance exists, or page has changed, create new instance
         if cls._instance is None or cls._page != page:
             logger.info("Creating new GradebookManager singleton instance")
@@ -64,13 +126,14 @@ class GradebookManager:
 
         return cls._instance
 
-    def __init__(self, page: Page, headless: bool = True):
+    def __init__(self, page: Page, headless: bool = True, singleton: bool = True):
         """
         Initialize the GradebookManager.
 
         Args:
             page: Playwright Page instance
             headless: Whether browser is running in headless mode
+            singleton: Share the class-level instance and login state (default)
         """
         # Only initialize once
         if not hasattr(self, "_initialized"):
@@ -81,17 +144,16 @@ class GradebookManager:
 
     @property
     def is_logged_in(self) -> bool:
-        """Get the logged-in status (class-level)."""
-        return self.__class__._is_logged_in
+        """Get the logged-in status (class-level unless singleton=False)."""
+        return self._is_logged_in
 
     @is_logged_in.setter
     def is_logged_in(self, value: bool):
-        """Set the logged-in status (class-level)."""
-        if self.__class__._is_logged_in != value:
-            logger.info(
-                f"Login status changed: {self.__class__._is_logged_in} -> {value}"
-            )
-        self.__class__._is_logged_in = value
+        """Set the logged-in status (class-level unless singleton=False)."""
+        owner = self if "_is_logged_in" in vars(self) else self.__class__
+        if owner._is_logged_in != value:
+            logger.info(f"Login status changed: {owner._is_logged_in} -> {value}")
+        owner._is_logged_in = value
 
     @staticmethod
     def normalize_course_name(course_name: str) -> str:
@@ -127,7 +189,7 @@ class GradebookManager:
             logger.info(f"Checking login status. Current URL: {current_url}")
 
             # Check for the login button - if it exists, we're not logged in
-            login_btn = self.page.locator(".loginBtn--lfDa2")
+            login_btn = self.page.locator(self._LOGIN_BUTTON)
             is_visible = await login_btn.is_visible(timeout=3000)
             logger.info(f"Login button visible: {is_visible}")
 
@@ -138,7 +200,7 @@ class GradebookManager:
 
             # Check multiple indicators of logged-in state
             # 1. Course list elements (on home page)
-            course_elements = await self.page.locator(".instance_name--dioD1").count()
+            course_elements = await self.page.locator(self._COURSE_ANCHOR).count()
             logger.info(f"Course list elements found: {course_elements}")
 
             if course_elements > 0:
@@ -147,7 +209,7 @@ class GradebookManager:
                 return True
 
             # 2. Gradebook tab (on course page)
-            gradebook_tab = await self.page.locator("#Launch-tab-gradebook").count()
+            gradebook_tab = await self.page.locator(self._GRADEBOOK_TAB).count()
             logger.info(f"Gradebook tab found: {gradebook_tab}")
 
             if gradebook_tab > 0:
@@ -195,33 +257,29 @@ class GradebookManager:
                 )
 
             # Click the login button
-            login_btn = self.page.locator(".loginBtn--lfDa2")
+            login_btn = self.page.locator(self._LOGIN_BUTTON)
             await login_btn.wait_for(state="visible", timeout=10000)
 
-            # Scroll into view and click
-            await login_btn.evaluate(
-                "element => element.scrollIntoView({block: 'center', behavior: 'smooth'})"
-            )
-            await self.page.wait_for_timeout(500)
+            # click() scrolls into view and waits for the button to be stable
             await login_btn.click()
             logger.info("Clicked login button")
 
             # Enter username
-            username_field = self.page.locator("#username")
+            username_field = self.page.locator(self._USERNAME_FIELD)
             await username_field.wait_for(state="visible", timeout=10000)
             await username_field.fill(NETACAD_INSTRUCTOR_ID)
             await username_field.press("Enter")
             logger.info("Username entered")
 
             # Enter password
-            password_field = self.page.locator("#password")
+            password_field = self.page.locator(self._PASSWORD_FIELD)
             await password_field.wait_for(state="visible", timeout=10000)
             await password_field.fill(NETACAD_INSTRUCTOR_PASSWORD)
             await password_field.press("Enter")
             logger.info("Password entered")
 
             # Wait for successful login
-            await self.page.wait_for_selector(".instance_name--dioD1", timeout=30000)
+            await self.page.wait_for_selector(self._COURSE_ANCHOR, timeout=30000)
             logger.info("Login successful")
 
             self.is_logged_in = True
@@ -263,8 +321,20 @@ class GradebookManager:
                 course_url, wait_until="domcontentloaded", timeout=30000
             )
 
-            # Wait a moment for the page to settle
-            await self.page.wait_for_timeout(1000)
+            # Wait for the course page (or a login redirect) to render instead
+            # of paying a fixed settle delay on every navigation
+            try:
+                await (
+                    self.page.locator(self._GRADEBOOK_TAB)
+                    .or_(
+                        self.page.locator(
+                            f"{self._USERNAME_FIELD}, {self._LOGIN_BUTTON}"
+                        )
+                    )
+                    .first.wait_for(state="attached", timeout=5000)
+                )
+            except PlaywrightTimeoutError:
+                logger.debug("No course or login markers yet, checking URL")
 
             # Check if we got redirected to login
             current_url = self.page.url
@@ -477,36 +547,38 @@ class GradebookManager:
                 "Pre-processing CSV to handle quoted spaces and malformed structure"
             )
 
-            cleaned_lines = []
-            with open(original_file_path, "r", encoding="utf-8", errors="replace") as f:
-                lines = f.readlines()
-
-            for i, line in enumerate(lines):
-                line = line.strip()
-                if not line:
-                    continue
-
-                # Replace quoted spaces with nothing (will become empty field)
-                # Pattern: , " " , becomes ,,
-                line = line.replace(', " "', ",")
-                line = line.replace('" " ,', ",")
-                line = line.replace(', " " ,', ",,")
-
-                # Strip extra whitespace around commas
-                # "NAME        , EMAIL" becomes "NAME,EMAIL"
-                line = re.sub(r"\s*,\s*", ",", line)
-
-                cleaned_lines.append(line)
-
-            logger.info(f"Pre-processed {len(cleaned_lines)} lines")
-
-            # Write to temporary file
+            # Stream line by line into the temp file so only one row is held
+            # in memory at a time
             temp_file_path = (
                 original_file_path.parent / f"temp_cleaned_{original_file_path.name}"
             )
-            with open(temp_file_path, "w", encoding="utf-8", newline="") as f:
-                f.write("\n".join(cleaned_lines))
+            num_lines = 0
+            header_line = None
+            with open(
+                original_file_path, "r", encoding="utf-8", errors="replace"
+            ) as rf, open(temp_file_path, "w", encoding="utf-8", newline="") as wf:
+                for line in rf:
+                    line = line.strip()
+                    if not line:
+                        continue
+
+                    # Replace quoted spaces with nothing (will become empty field)
+                    # Pattern: , " " , becomes ,,
+                    line = line.replace(', " "', ",")
+                    line = line.replace('" " ,', ",")
+                    line = line.replace(', " " ,', ",,")
+
+                    # Strip extra whitespace around commas
+                    # "NAME        , EMAIL" becomes "NAME,EMAIL"
+                    line = COMMA_WHITESPACE_PATTERN.sub(",", line)
 
+                    if header_line is None:
+                        header_line = line
+                    wf.write(line)
+                    wf.write("\n")
+                    num_lines += 1
+
+            logger.info(f"Pre-processed {num_lines} lines")
             logger.info(f"Wrote cleaned CSV to temp file: {temp_file_path}")
 
             # Now read the cleaned CSV with pandas
@@ -514,11 +586,9 @@ class GradebookManager:
             # that don't have headers. We need to explicitly tell pandas to only use
             # the columns that are actually in the header.
 
-            # First, read just the header to get column count
-            with open(temp_file_path, "r", encoding="utf-8") as f:
-                header_line = f.readline().strip()
-                num_columns = header_line.count(",") + 1
-                logger.info(f"Header has {num_columns} columns")
+            # The header was captured while streaming, so no second read is needed
+            num_columns = (header_line or "").count(",") + 1
+            logger.info(f"Header has {num_columns} columns")
 
             df = pd.read_csv(
                 str(temp_file_path),
@@ -685,31 +755,30 @@ class GradebookManager:
             Tuple of (success: bool, csv_path: str, markdown_path: str)
         """
         try:
-            logger.info(f"Executing gradebook export for: {course_id}")
+            logger.info("Executing gradebook export for: %s", course_id)
 
             # Click gradebook tab
-            gradebook_tab = self.page.locator("#Launch-tab-gradebook")
+            gradebook_tab = self.page.locator(self._GRADEBOOK_TAB)
             await gradebook_tab.click()
             logger.info("Clicked gradebook tab, checking for export button...")
 
             # FAST CHECK: Does this course have an export button? (fail fast if not)
-            export_dropdown = self.page.locator("button.iconDownload--RKrnV")
+            export_dropdown = self.page.locator(self._EXPORT_DROPDOWN)
             try:
                 await export_dropdown.wait_for(state="visible", timeout=5000)
                 logger.info("✓ Export button found - course has gradebook")
             except Exception as e:
                 logger.warning(
-                    f"✗ No export button found - course likely has no gradebook data yet"
+                    "✗ No export button found - course likely has no gradebook data yet"
                 )
                 return False, "", ""
 
             # Click export dropdown
             logger.info("Opening export dropdown...")
             await export_dropdown.click()
-            await asyncio.sleep(0.5)
 
-            # Click "Export All"
-            export_all_btn = self.page.locator(".dropdownButton--whS7t").first
+            # Click "Export All" as soon as the menu renders it
+            export_all_btn = self.page.locator(self._EXPORT_ALL_BUTTON).first
             await export_all_btn.wait_for(state="visible", timeout=5000)
             await export_all_btn.click()
             logger.info("Clicked 'Export All' button")
@@ -718,31 +787,36 @@ class GradebookManager:
             await self._handle_export_modal()
 
             # Try to refresh and wait for dropdown with retries
-            refresh_btn = self.page.locator("#refreshExportList")
-            dropdown_button = self.page.locator("#dropdown-basic")
+            refresh_btn = self.page.locator(self._REFRESH_EXPORTS_BUTTON)
+            dropdown_button = self.page.locator(self._EXPORT_LIST_BUTTON)
 
             max_refresh_attempts = 2
             dropdown_found = False
 
             for attempt in range(max_refresh_attempts):
-                logger.info(f"Refresh attempt {attempt + 1}/{max_refresh_attempts}")
-                await refresh_btn.click()
-                logger.info("Clicked refresh button, waiting for dropdown...")
-
-                # Wait a bit for the export to be processed
-                await asyncio.sleep(1.5)  # Reduced from 2s
+                logger.info("Refresh attempt %d/%d", attempt + 1, max_refresh_attempts)
+                # Wait for the refreshed export list to come back before the
+                # first link is read, so it is the export just requested
+                try:
+                    async with self.page.expect_response(
+                        _is_export_list_response, timeout=5000
+                    ):
+                        await refresh_btn.click()
+                    logger.info("Export list refreshed, waiting for dropdown...")
+                except PlaywrightTimeoutError:
+                    logger.warning(
+                        "No export list response after refresh, pausing instead"
+                    )
+                    await asyncio.sleep(1.5)
 
-                # Check if dropdown button appeared
                 try:
-                    await dropdown_button.wait_for(
-                        state="visible", timeout=5000
-                    )  # Reduced from 8s
+                    await dropdown_button.wait_for(state="visible", timeout=5000)
                     logger.info("Dropdown button found and visible")
                     dropdown_found = True
                     break
                 except Exception as e:
                     logger.warning(
-                        f"Dropdown not found on attempt {attempt + 1}: {str(e)}"
+                        "Dropdown not found on attempt %d: %s", attempt + 1, e
                     )
                     if attempt < max_refresh_attempts - 1:
                         logger.info("Will retry refresh...")
@@ -750,12 +824,11 @@ class GradebookManager:
 
             if not dropdown_found:
                 logger.error(
-                    f"Failed to find dropdown after {max_refresh_attempts} refresh attempts"
+                    "Failed to find dropdown after %d refresh attempts",
+                    max_refresh_attempts,
                 )
                 return False, "", ""
 
-            # Brief pause for UI to settle
-            await asyncio.sleep(1)
             logger.info("Dropdown button ready")
 
             # Open dropdown with retries
@@ -763,85 +836,63 @@ class GradebookManager:
                 logger.error("Failed to open export dropdown")
                 return False, "", ""
 
-            # Click first export link to download
-            export_links = self.page.locator(".dropdown-item.dropdownItem--gyPVf")
-            link_count = await export_links.count()
-
-            if link_count > 0:
-                logger.info(f"Found {link_count} export link(s), clicking first one")
-                first_link = export_links.first
-
-                # Ensure link is visible and clickable
-                await first_link.wait_for(state="visible", timeout=5000)
+            # Click first export link to download; _open_export_dropdown has
+            # already confirmed the menu lists at least one
+            first_link = self.page.locator(self._EXPORT_LINK).first
 
-                # Set up download expectation BEFORE clicking
-                try:
-                    logger.info("Setting up download handler...")
-                    async with self.page.expect_download(
-                        timeout=30000
-                    ) as download_info:
-                        await first_link.click()
-                        logger.info(
-                            "Clicked download link, waiting for download to start..."
-                        )
-
-                    # Get the download
-                    download = await download_info.value
-                    original_filename = download.suggested_filename
-                    logger.info(f"Download started: {original_filename}")
+            # Set up download expectation BEFORE clicking
+            try:
+                logger.info("Setting up download handler...")
+                async with self.page.expect_download(timeout=30000) as download_info:
+                    await first_link.click()
+                    logger.info(
+                        "Clicked download link, waiting for download to start..."
+                    )
 
-                    # Create new filename with course name and timestamp
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    normalized_name = self.normalize_course_name(course_name)
-                    new_filename = f"{normalized_name}_{timestamp}.csv"
+                # Get the download
+                download = await download_info.value
+                original_filename = download.suggested_filename
+                logger.info("Download started: %s", original_filename)
 
-                    logger.info(f"Renaming to: {new_filename}")
+                # Create new filename with course name and timestamp
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                normalized_name = self.normalize_course_name(course_name)
+                new_filename = f"{normalized_name}_{timestamp}.csv"
 
-                    # Save to our gradebook directory with new name
-                    save_path = GRADEBOOK_DIR / new_filename
-                    await download.save_as(str(save_path))
-                    logger.info(f"File saved to: {save_path}")
+                logger.info("Renaming to: %s", new_filename)
 
-                    # Process the file
-                    success, csv_path, markdown_path = self.process_csv_file(
-                        new_filename, course_id, course_name
-                    )
+                # Save to our gradebook directory with new name
+                save_path = GRADEBOOK_DIR / new_filename
+                await download.save_as(str(save_path))
+                logger.info("File saved to: %s", save_path)
 
-                    if success:
-                        logger.info(
-                            f"Successfully processed gradebook for {course_name}"
-                        )
-                        return True, csv_path, markdown_path
-                    else:
-                        logger.error(f"Failed to process files for {course_id}")
-                        return False, "", ""
+                # Process the file off the event loop so the other parallel
+                # workers keep driving their pages during the pandas work
+                success, csv_path, markdown_path = await asyncio.to_thread(
+                    self.process_csv_file, new_filename, course_id, course_name
+                )
 
-                except PlaywrightTimeoutError:
-                    logger.error(
-                        "Download timeout - no download started within 30 seconds"
-                    )
-                    return False, "", ""
-                except Exception as download_error:
-                    logger.error(f"Download error: {download_error}", exc_info=True)
+                if success:
+                    logger.info("Successfully processed gradebook for %s", course_name)
+                    return True, csv_path, markdown_path
+                else:
+                    logger.error("Failed to process files for %s", course_id)
                     return False, "", ""
-            else:
-                logger.error("No export links found in dropdown")
-                # Take screenshot for debugging
-                try:
-                    screenshot_path = GRADEBOOK_DIR / f"error_{course_id}.png"
-                    await self.page.screenshot(path=str(screenshot_path))
-                    logger.info(f"Saved error screenshot to {screenshot_path}")
-                except:
-                    pass
+
+            except PlaywrightTimeoutError:
+                logger.error("Download timeout - no download started within 30 seconds")
+                return False, "", ""
+            except Exception as download_error:
+                logger.error("Download error: %s", download_error, exc_info=True)
                 return False, "", ""
 
         except Exception as e:
-            logger.error(f"Error executing gradebook export: {e}", exc_info=True)
+            logger.error("Error executing gradebook export: %s", e, exc_info=True)
             # Take screenshot for debugging
             try:
                 screenshot_path = GRADEBOOK_DIR / f"error_{course_id}_exception.png"
                 await self.page.screenshot(path=str(screenshot_path))
-                logger.info(f"Saved error screenshot to {screenshot_path}")
+                logger.info("Saved error screenshot to %s", screenshot_path)
             except:
                 pass
             return False, "", ""
@@ -850,63 +901,29 @@ class GradebookManager:
         """Handle the export confirmation modal that appears."""
         try:
             # Wait for modal with a reasonable timeout
-            await self.page.wait_for_selector(
-                ".exportCsvModal--XL37A.modal.show", timeout=10000
-            )
+            await self.page.wait_for_selector(self._EXPORT_MODAL_SHOWN, timeout=10000)
             logger.info("Export modal appeared")
 
-            # Brief pause to ensure modal is fully rendered
-            await asyncio.sleep(0.5)
-
-            # Try multiple strategies to close it
-            closed = False
-
-            # Strategy 1: Click OK/Close button (most common)
-            if not closed:
-                try:
-                    # Try common button text patterns
-                    modal_button = self.page.locator(
-                        ".exportCsvModal--XL37A button:has-text('OK'), "
-                        ".exportCsvModal--XL37A button:has-text('Okay'), "
-                        ".exportCsvModal--XL37A button:has-text('Close'), "
-                        ".exportCsvModal--XL37A button.btn-primary"
-                    ).first
-                    await modal_button.wait_for(state="visible", timeout=3000)
-                    await modal_button.click()
-                    logger.info("Clicked modal button")
-                    closed = True
-                except Exception as e:
-                    logger.debug(f"Strategy 1 failed: {e}")
-
-            # Strategy 2: Click X button
-            if not closed:
-                try:
-                    close_btn = self.page.locator(
-                        ".exportCsvModal--XL37A button.close, "
-                        ".exportCsvModal--XL37A [aria-label='Close'], "
-                        ".exportCsvModal--XL37A .modal-header button"
-                    ).first
-                    await close_btn.wait_for(state="visible", timeout=2000)
-                    await close_btn.click()
-                    logger.info("Clicked close button")
-                    closed = True
-                except Exception as e:
-                    logger.debug(f"Strategy 2 failed: {e}")
+            # Probe for and click the close control in a single evaluate instead
+            # of waiting on each candidate locator in turn
+            closed = await self.page.evaluate(CLOSE_EXPORT_MODAL_JS)
+            if closed:
+                logger.info("Clicked modal close button")
 
-            # Strategy 3: Press Escape key
+            # Fall back to the Escape key
             if not closed:
                 try:
                     await self.page.keyboard.press("Escape")
                     logger.info("Pressed Escape key")
                     closed = True
                 except Exception as e:
-                    logger.debug(f"Strategy 3 failed: {e}")
+                    logger.debug("Escape key failed: %s", e)
 
             # Wait for modal to disappear (with extended timeout)
             if closed:
                 try:
                     await self.page.wait_for_selector(
-                        ".exportCsvModal--XL37A.modal.show",
+                        self._EXPORT_MODAL_SHOWN,
                         state="hidden",
                         timeout=8000,
                     )
@@ -922,7 +939,7 @@ class GradebookManager:
         except PlaywrightTimeoutError:
             logger.info("No export modal appeared (may not be required)")
         except Exception as e:
-            logger.warning(f"Modal handling error: {e}, continuing anyway")
+            logger.warning("Modal handling error: %s, continuing anyway", e)
 
     async def _open_export_dropdown(self, max_attempts: int = 3) -> bool:
         """
@@ -936,38 +953,26 @@ class GradebookManager:
         """
         for attempt in range(max_attempts):
             try:
-                dropdown_button = self.page.locator("#dropdown-basic")
-
-                # Ensure button is visible and clickable
-                await dropdown_button.wait_for(state="visible", timeout=5000)
-                await dropdown_button.scroll_into_view_if_needed()
-                await asyncio.sleep(0.3)  # Brief pause for rendering
-
-                await dropdown_button.click()
-                logger.info(f"Clicked dropdown button (attempt {attempt + 1})")
-
-                # Wait for dropdown menu to appear
-                await self.page.wait_for_selector(
-                    ".dropdown__menu.dropdown-menu.show a", timeout=8000
-                )
-
-                # Verify we have export links
-                export_links = await self.page.locator(
-                    ".dropdown-item.dropdownItem--gyPVf"
-                ).count()
-                if export_links > 0:
-                    logger.info(
-                        f"Export dropdown opened successfully with {export_links} link(s)"
+                # click() already waits for the button to be visible, stable
+                # and scrolled into view
+                dropdown_button = self.page.locator(self._EXPORT_LIST_BUTTON)
+                await dropdown_button.click(timeout=5000)
+                logger.info("Clicked dropdown button (attempt %d)", attempt + 1)
+
+                # Wait for the open menu and count its export links in one
+                # browser-side poll instead of wait + count round-trips
+                export_links = await (
+                    await self.page.wait_for_function(
+                        EXPORT_MENU_READY_JS, timeout=8000
                     )
-                    return True
-                else:
-                    logger.warning("Dropdown opened but no export links found")
-                    if attempt < max_attempts - 1:
-                        await asyncio.sleep(2)
-                        continue
+                ).json_value()
+                logger.info(
+                    "Export dropdown opened successfully with %d link(s)", export_links
+                )
+                return True
 
             except Exception as e:
-                logger.warning(f"Attempt {attempt + 1}/{max_attempts} failed: {e}")
+                logger.warning("Attempt %d/%d failed: %s", attempt + 1, max_attempts, e)
                 if attempt < max_attempts - 1:
                     await asyncio.sleep(2)
 
@@ -1035,26 +1040,28 @@ class GradebookManager:
         self, courses: List[Dict[str, str]], max_workers: int
     ) -> List[Dict[str, any]]:
         """
-        Download gradebooks in parallel using multiple browser contexts.
-        Each worker gets its own browser context with independent session/cookies.
+        Download gradebooks in parallel using a pool of browser contexts.
+        Each worker owns one context (independent session/cookies) and keeps it,
+        along with its login, for every course it pulls from the shared queue.
 
         This is MUCH faster than sequential (4-5x speedup typically).
         """
         from playwright.async_api import async_playwright
 
         # Limit workers to avoid overwhelming the server
-        max_workers = min(max_workers, 10)
+        max_workers = min(max_workers, 10, len(courses))
 
         logger.info(f"🚀 Starting parallel downloads with {max_workers} workers")
         logger.info(f"📦 Total courses: {len(courses)}")
 
-        # We need the browser instance from the current page
-        # But we'll create new contexts for each worker
-        playwright = async_playwright()
-        p = await playwright.start()
-
-        try:
-            # Launch browser (reuse same browser, but multiple contexts)
+        # Share the Chrome process behind the current page: each worker only
+        # adds its own context/tab instead of a second browser process
+        p = None
+        browser = self.page.context.browser
+        if browser is None or not browser.is_connected():
+            # Persistent contexts have no Browser handle, so launch our own
+            logger.info("No shared browser available, launching a dedicated one")
+            p = await async_playwright().start()
             browser = await p.chromium.launch(
                 headless=self.headless,
                 args=[
@@ -1064,93 +1071,108 @@ class GradebookManager:
                 ],
             )
 
-            # Create a semaphore to limit concurrent downloads
-            semaphore = asyncio.Semaphore(max_workers)
-
-            async def download_with_semaphore(course_info: Dict[str, str], index: int):
-                """Download a single gradebook with semaphore control."""
-                async with semaphore:
-                    logger.info(
-                        f"[Worker {index}/{len(courses)}] Starting: {course_info['course_name']}"
-                    )
+        try:
+            # Shared work queue: idle workers pull the next course
+            course_queue: asyncio.Queue = asyncio.Queue()
+            for idx, course in enumerate(courses):
+                course_queue.put_nowait((idx, course))
+
+            results: List[Optional[Dict[str, any]]] = [None] * len(courses)
+
+            async def worker(worker_id: int):
+                """Drain the course queue with one reusable, logged-in context."""
+                # CRITICAL: Must have accept_downloads=True for gradebook downloads!
+                context = await browser.new_context(
+                    accept_downloads=True,  # Enable downloads
+                    viewport={"width": 1920, "height": 1080},
+                )
+                await block_heavy_resources(context)
+                page = await context.new_page()
 
-                    # Create a new browser context (independent session)
-                    # CRITICAL: Must have accept_downloads=True for gradebook downloads!
-                    context = await browser.new_context(
-                        accept_downloads=True,  # Enable downloads
-                        viewport={"width": 1920, "height": 1080},
-                    )
-                    page = await context.new_page()
+                # One standalone GradebookManager per worker page, so workers
+                # neither replace the caller's singleton nor share its login
+                # state; login happens on the first course and is reused for
+                # the rest of the queue
+                manager = GradebookManager(page, self.headless, singleton=False)
 
-                    # Create a new GradebookManager instance for this worker
-                    # Simply instantiate normally - each page is different so no singleton conflict
-                    manager = GradebookManager(page, self.headless)
+                try:
+                    while True:
+                        try:
+                            idx, course_info = course_queue.get_nowait()
+                        except asyncio.QueueEmpty:
+                            return
 
-                    try:
-                        result = await manager.download_gradebook(
-                            course_info["course_id"],
-                            course_info["course_name"],
-                            course_info["course_url"],
-                        )
-                        status = "✓" if result["success"] else "✗"
-                        error_msg = (
-                            f" - Error: {result.get('error', 'Unknown')}"
-                            if not result["success"]
-                            else ""
-                        )
+                        index = idx + 1
                         logger.info(
-                            f"[Worker {index}/{len(courses)}] {status} Completed: {course_info['course_name']}{error_msg}"
+                            f"[Worker {worker_id}] [{index}/{len(courses)}] Starting: {course_info['course_name']}"
                         )
-                        return result
-                    except Exception as e:
-                        logger.error(
-                            f"[Worker {index}/{len(courses)}] ✗ Exception: {course_info['course_name']}: {e}",
-                            exc_info=True,
-                        )
-                        return {
-                            "success": False,
-                            "course_id": course_info["course_id"],
-                            "course_name": course_info["course_name"],
-                            "csv_path": "",
-                            "markdown_path": "",
-                            "error": str(e),
-                        }
-                    finally:
-                        await context.close()
-
-            # Create tasks for all downloads
-            tasks = [
-                download_with_semaphore(course, idx + 1)
-                for idx, course in enumerate(courses)
-            ]
-
-            # Run all tasks concurrently and gather results
+                        try:
+                            result = await manager.download_gradebook(
+                                course_info["course_id"],
+                                course_info["course_name"],
+                                course_info["course_url"],
+                            )
+                            status = "✓" if result["success"] else "✗"
+                            error_msg = (
+                                f" - Error: {result.get('error', 'Unknown')}"
+                                if not result["success"]
+                                else ""
+                            )
+                            logger.info(
+                                f"[Worker {worker_id}] [{index}/{len(courses)}] {status} Completed: {course_info['course_name']}{error_msg}"
+                            )
+                        except Exception as e:
+                            logger.error(
+                                f"[Worker {worker_id}] [{index}/{len(courses)}] ✗ Exception: {course_info['course_name']}: {e}",
+                                exc_info=True,
+                            )
+                            result = {
+                                "success": False,
+                                "course_id": course_info["course_id"],
+                                "course_name": course_info["course_name"],
+                                "csv_path": "",
+                                "markdown_path": "",
+                                "error": str(e),
+                            }
+                        results[idx] = result
+                finally:
+                    await context.close()
+
+            # Run the worker pool and wait for the queue to drain
             import time
 
             start_time = time.time()
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            worker_errors = await asyncio.gather(
+                *(worker(worker_id) for worker_id in range(1, max_workers + 1)),
+                return_exceptions=True,
+            )
             elapsed = time.time() - start_time
 
-            # Convert exceptions to error results
-            final_results = []
-            for i, result in enumerate(results):
-                if isinstance(result, Exception):
-                    final_results.append(
-                        {
-                            "success": False,
-                            "course_id": courses[i]["course_id"],
-                            "course_name": courses[i]["course_name"],
-                            "csv_path": "",
-                            "markdown_path": "",
-                            "error": str(result),
-                        }
-                    )
-                else:
-                    final_results.append(result)
+            for worker_error in worker_errors:
+                if isinstance(worker_error, Exception):
+                    logger.error(f"Worker failed: {worker_error}")
+
+            # Courses never processed (e.g. every worker failed to start)
+            final_results = [
+                (
+                    result
+                    if result is not None
+                    else {
+                        "success": False,
+                        "course_id": course["course_id"],
+                        "course_name": course["course_name"],
+                        "csv_path": "",
+                        "markdown_path": "",
+                        "error": "Course was not processed by any worker",
+                    }
+                )
+                for course, result in zip(courses, results)
+            ]
 
-            # Summary
-            successful = sum(1 for r in final_results if r["success"])
-            failed = len(final_results) - successful
+            # Summary: partition once and reuse the failures for the report
+            failed_results = [r for r in final_results if not r["success"]]
+            failed = len(failed_results)
+            successful = len(final_results) - failed
             avg_time = elapsed / len(courses)
 
             logger.info("=" * 60)
@@ -1167,19 +1189,20 @@ class GradebookManager:
             # Log failed courses for debugging
             if failed > 0:
                 logger.warning(f"⚠️  {failed} downloads failed:")
-                for r in final_results:
-                    if not r["success"]:
-                        logger.warning(
-                            f"  - {r['course_name']}: {r.get('error', 'Unknown error')}"
-                        )
+                for r in failed_results:
+                    logger.warning(
+                        f"  - {r['course_name']}: {r.get('error', 'Unknown error')}"
+                    )
 
             logger.info("=" * 60)
 
-            await browser.close()
+            if p is not None:
+                await browser.close()
             return final_results
 
         finally:
-            await p.stop()
+            if p is not None:
+                await p.stop()
 
     @staticmethod
     def create_gradebook_zip(
@@ -1217,8 +1240,9 @@ class GradebookManager:
                         csv_path = Path(result["csv_path"])
                         # Use the filename from the path (already has course name + timestamp)
                         zip_filename = csv_path.name
-                        with open(csv_path, "rb") as f:
-                            zip_file.writestr(zip_filename, f.read())
+                        # write() streams the file in chunks instead of reading
+                        # the whole export into memory first
+                        zip_file.write(csv_path, arcname=zip_filename)
                         logger.info(f"Added to zip: {zip_filename}")
 
                     # Add Markdown file if requested
@@ -1230,8 +1254,7 @@ class GradebookManager:
                         md_path = Path(result["markdown_path"])
                         # Use the filename from the path (already has course name + timestamp)
                         zip_filename = md_path.name
-                        with open(md_path, "rb") as f:
-                            zip_file.writestr(zip_filename, f.read())
+                        zip_file.write(md_path, arcname=zip_filename)
                         logger.info(f"Added to zip: {zip_filename}")
 
                 # Add summary file
@@ -1253,14 +1276,15 @@ class GradebookManager:
     @staticmethod
     def _create_download_summary(results: List[Dict[str, any]]) -> str:
         """Create a text summary of the download operation."""
+        successful = sum(1 for r in results if r["success"])
         lines = [
             "=" * 80,
             "GRADEBOOK DOWNLOAD SUMMARY",
             "=" * 80,
             f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
             f"Total Courses: {len(results)}",
-            f"Successful: {sum(1 for r in results if r['success'])}",
-            f"Failed: {sum(1 for r in results if not r['success'])}",
+            f"Successful: {successful}",
+            f"Failed: {len(results) - successful}",
             "",
             "=" * 80,
             "COURSE DETAILS",
@@ -80,6 +80,28 @@ def get_context_config() -> Dict[str, Any]:
     }
 
 
+# Resource types the gradebook flow never reads; stylesheets are kept because
+# the selectors depend on rendered class names
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+
+async def _abort_blocked_resources(route) -> None:
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def block_heavy_resources(context) -> None:
+    """
+    Abort image, font and media requests for every page in a browser context.
+
+    Args:
+        context: Playwright BrowserContext to install the route on
+    """
+    await context.route("**/*", _abort_blocked_resources)
+
+
 def is_containerized() -> bool:
     """
     Detect if running in a containerized environment.
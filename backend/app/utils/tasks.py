@@ -31,56 +31,92 @@ async def sync_courses_background(sync_id: str):
 
         # Track sync statistics
         new_courses = []
-        existing_courses = []
         updated_courses = []
 
-        # Process each scraped course
-        for course_id, url, name, start_date, end_date in zip(
-            course_ids, course_urls, course_names, start_dates, end_dates
-        ):
-            try:
-                # Check if course already exists in DB
-                existing_course = Courses.get_course_by_course_id(course_id)
-
-                if existing_course:
-                    # Course exists - check if we need to update it
-                    # Note: We're not comparing dates here as they may change frequently
-                    # Always update to ensure we have the latest date information
+        # Keyed by course_id so a repeated scrape can't break the batches
+        scraped_courses = {
+            course_id: {
+                "course_id": course_id,
+                "name": name,
+                "url": url,
+                "status": "active",
+                "start_date": start_date,
+                "end_date": end_date,
+            }
+            for course_id, url, name, start_date, end_date in zip(
+                course_ids, course_urls, course_names, start_dates, end_dates
+            )
+        }
+
+        # Update every course already in the DB in one transaction.
+        # Note: We're not comparing dates here as they may change frequently
+        # Always update to ensure we have the latest date information
+        try:
+            updated = Courses.update_bulk_courses(list(scraped_courses.values()))
+        except Exception as e:
+            # Retry one transaction per course so a bad row only fails itself
+            logger.error(
+                f"Bulk course update failed, retrying per course: {e}", exc_info=True
+            )
+            updated = []
+            for course_id, course_data in list(scraped_courses.items()):
+                try:
                     updated_course = Courses.update_course(
                         course_id=course_id,
-                        name=name,
-                        url=url,
-                        start_date=start_date,
-                        end_date=end_date,
+                        name=course_data["name"],
+                        url=course_data["url"],
+                        start_date=course_data["start_date"],
+                        end_date=course_data["end_date"],
                     )
-                    if updated_course:
-                        updated_courses.append(course_id)
-                        logger.info(f"Updated course: {course_id} - {name}")
-                    else:
-                        existing_courses.append(course_id)
-                else:
-                    # New course - insert into database
-                    new_course = Courses.insert_new_course(
-                        course_id=course_id,
-                        name=name,
-                        url=url,
-                        status="active",
-                        start_date=start_date,
-                        end_date=end_date,
+                except Exception as e:
+                    logger.error(
+                        f"Error processing course {course_id}: {e}", exc_info=True
                     )
+                    failed_course_count += 1
+                    scraped_courses.pop(course_id)
+                    continue
+                if updated_course:
+                    updated.append(updated_course)
+
+        for course in updated:
+            scraped_courses.pop(course.course_id, None)
+            updated_courses.append(course.course_id)
+            logger.info(f"Updated course: {course.course_id} - {course.name}")
+
+        # Whatever didn't match an existing row is new; insert in one commit
+        if scraped_courses:
+            try:
+                inserted = Courses.insert_bulk_courses(list(scraped_courses.values()))
+            except Exception as e:
+                logger.error(f"Bulk course insert failed: {e}", exc_info=True)
+                inserted = []
+
+            if not inserted:
+                # Retry one insert per course so a bad row only fails itself
+                logger.error(
+                    f"Failed to insert {len(scraped_courses)} new courses in bulk, "
+                    "retrying per course"
+                )
+                for course_id, course_data in scraped_courses.items():
+                    try:
+                        new_course = Courses.insert_new_course(**course_data)
+                    except Exception as e:
+                        logger.error(
+                            f"Error processing course {course_id}: {e}", exc_info=True
+                        )
+                        new_course = None
                     if new_course:
-                        new_courses.append(course_id)
-                        logger.info(f"Added new course: {course_id} - {name}")
+                        inserted.append(new_course)
+                    else:
+                        failed_course_count += 1
 
-            except Exception as e:
-                logger.error(f"Error processing course {course_id}: {e}", exc_info=True)
-                failed_course_count += 1
-                continue
+            for course in inserted:
+                new_courses.append(course.course_id)
+                logger.info(f"Added new course: {course.course_id} - {course.name}")
 
         logger.info(
             f"Sync complete - Total: {len(course_ids)}, "
             f"New: {len(new_courses)}, "
-            f"Existing: {len(existing_courses)}, "
             f"Updated: {len(updated_courses)}, "
             f"Failed: {failed_course_count}"
         )
@@ -92,7 +128,6 @@ async def sync_courses_background(sync_id: str):
             total_scraped=len(course_ids),
             new_courses=len(new_courses),
             updated_courses=len(updated_courses),
-            existing_courses=len(existing_courses),
             failed_courses=failed_course_count,
         )
 
@@ -87,12 +87,8 @@ OPTIMIZED_TIMEOUTS = {
 def create_directory_safely(directory_path: Path, description: str) -> bool:
     """Create directory safely with error handling and logging."""
     try:
+        # mkdir raises on failure, so no follow-up exists() check is needed
         directory_path.mkdir(parents=True, exist_ok=True)
-        if not directory_path.exists():
-            print(
-                f"Warning: Failed to create {description} directory: {directory_path}"
-            )
-            return False
         return True
     except PermissionError:
         print(
@@ -118,6 +114,10 @@ create_directory_safely(CSV_DATA_DIR, "CSV data")
 MD_DATA_DIR = DATA_DIR / "markdown"
 create_directory_safely(MD_DATA_DIR, "Markdown data")
 
+# Persistent Chrome profile so the NetAcad login session survives between runs
+CHROME_PROFILE_DIR = DATA_DIR / "chrome_profile"
+create_directory_safely(CHROME_PROFILE_DIR, "Chrome profile")
+
 
 # Validation summary for debugging
 def validate_setup():
@@ -1,13 +1,32 @@
 import asyncio
+import atexit
+import json
 import logging
 import os
+import queue
 import re
+import time
 from datetime import datetime
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import List, Tuple
+from typing import Iterator, List, TextIO, Tuple
 
 import pandas as pd
 from playwright.async_api import Browser, BrowserContext, Page, async_playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow  # noqa: F401
+
+    CSV_ENGINE = "pyarrow"  # Multi-threaded CSV parser, much faster on wide gradebooks
+except ImportError:
+    CSV_ENGINE = "c"
 
 from constants import (
     BASE_URL,
@@ -16,6 +35,7 @@ from constants import (
     INSTRUCTOR_ID,
     INSTRUCTOR_PASSWORD,
     LOGS_DIR,
+    MAX_WORKERS,
     MD_DATA_DIR,
     WEBDRIVER_TIMEOUT,
     validate_setup,
@@ -28,50 +48,72 @@ else:
     print("Setup validation passed. Proceeding with course export...")
 
 log_file = LOGS_DIR / "course_export_playwright.log"
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler(str(log_file), mode="w", encoding="utf-8"),
-        logging.StreamHandler(),
-    ],
-)
+log_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+log_handlers = [
+    logging.FileHandler(str(log_file), mode="w", encoding="utf-8", delay=True),
+    logging.StreamHandler(),
+]
+for log_handler in log_handlers:
+    log_handler.setFormatter(log_formatter)
+
+# Log records are handed to a background thread, so file and console writes
+# never block the event loop while pages are being driven
+log_queue: queue.SimpleQueue = queue.SimpleQueue()
+log_listener = QueueListener(log_queue, *log_handlers)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(log_queue)])
 logger = logging.getLogger(__name__)
 
-# Pre-compile regex patterns for performance
+# Pre-compile regex patterns for exported gradebook files (used with fullmatch)
 CSV_PATTERN = re.compile(
-    r"^GRADEBOOK_DATA_\d{4}_\d{2}_\d{2}T\d{2}_\d{2}_\d{2}Z_[\w-]+\.csv$"
+    r"GRADEBOOK_DATA_\d{4}_\d{2}_\d{2}T\d{2}_\d{2}_\d{2}Z_[\w-]+\.csv"
 )
 MD_PATTERN = re.compile(
-    r"^GRADEBOOK_DATA_\d{4}_\d{2}_\d{2}T\d{2}_\d{2}_\d{2}Z_[\w-]+\.md$"
+    r"GRADEBOOK_DATA_\d{4}_\d{2}_\d{2}T\d{2}_\d{2}_\d{2}Z_[\w-]+\.md"
 )
 
 
+def _clear_dir(directory: Path, pattern: re.Pattern, label: str) -> int:
+    """Deletes files in one directory matching the export pattern."""
+    files_deleted = 0
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if pattern.fullmatch(entry.name) and entry.is_file():
+                    os.remove(entry.path)
+                    files_deleted += 1
+                    logger.debug("Deleted old %s: %s", label, entry.path)
+    except FileNotFoundError:
+        pass
+    return files_deleted
+
+
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+
+async def abort_heavy_resources(route):
+    """Aborts requests for resource types the export flow never reads."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
 async def clear_old_downloads():
     """Deletes old CSV and Markdown files before new exports start."""
     try:
-        # Clear from main DATA_DIR (downloaded files)
-        for file in os.listdir(str(DATA_DIR)):
-            if file.endswith(".csv") and CSV_PATTERN.match(file):
-                file_path = DATA_DIR / file
-                os.remove(str(file_path))
-                logger.info(f"Deleted old download: {file_path}")
-
-        # Clear organized CSV files
-        if CSV_DATA_DIR.exists():
-            for file in os.listdir(str(CSV_DATA_DIR)):
-                if file.endswith(".csv") and CSV_PATTERN.match(file):
-                    file_path = CSV_DATA_DIR / file
-                    os.remove(str(file_path))
-                    logger.info(f"Deleted old CSV export: {file_path}")
-
-        # Clear Markdown files
-        if MD_DATA_DIR.exists():
-            for file in os.listdir(str(MD_DATA_DIR)):
-                if file.endswith(".md") and MD_PATTERN.match(file):
-                    file_path = MD_DATA_DIR / file
-                    os.remove(str(file_path))
-                    logger.info(f"Deleted old Markdown export: {file_path}")
+        # The three directories are independent, so overlap their IO on worker
+        # threads. Only files matching the export patterns are removed, since
+        # these directories are shared with the Selenium scraper
+        results = await asyncio.gather(
+            asyncio.to_thread(_clear_dir, DATA_DIR, CSV_PATTERN, "download"),
+            asyncio.to_thread(_clear_dir, CSV_DATA_DIR, CSV_PATTERN, "CSV export"),
+            asyncio.to_thread(_clear_dir, MD_DATA_DIR, MD_PATTERN, "Markdown export"),
+        )
+        files_deleted = sum(results)
+        logger.info(f"Cleared {files_deleted} old export files")
 
     except Exception as e:
         logger.error(f"Error clearing old files: {e}", exc_info=True)
@@ -85,12 +127,13 @@ def create_markdown_export(
         md_filename = csv_filename.replace(".csv", ".md")
         md_file_path = MD_DATA_DIR / md_filename
 
-        markdown_content = generate_gradebook_markdown(df, course_id, course_name)
+        # Write through a 1 MiB buffer so the export goes out in few syscalls.
+        # The preamble and footer are streamed, but to_markdown still renders
+        # the table as one string before writing it
+        with open(md_file_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+            write_gradebook_markdown(f, df, course_id, course_name)
 
-        with open(md_file_path, "w", encoding="utf-8") as f:
-            f.write(markdown_content)
-
-        logger.info(f"Markdown export saved to: {md_file_path}")
+        logger.info("Markdown export saved to: %s", md_file_path)
         return True, str(md_file_path)
 
     except Exception as e:
@@ -98,124 +141,128 @@ def create_markdown_export(
         return False, ""
 
 
-def generate_gradebook_markdown(
-    df: pd.DataFrame, course_id: str, course_name: str
-) -> str:
-    """Generates formatted Markdown content from gradebook data optimized for LLM consumption."""
-    export_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    total_students = len(df)
-
-    markdown_lines = [
-        f"# NetAcad Gradebook Export",
-        "",
-        f"## Course Information",
-        f"- **Course ID:** {course_id}",
-        f"- **Course Name:** {course_name}",
-        f"- **Export Date:** {export_date}",
-        f"- **Total Students:** {total_students}",
-        "",
-        "---",
-        "",
-    ]
+@lru_cache(maxsize=1024)
+def _pretty_column_name(col: str) -> str:
+    """Formats a gradebook column name for the Markdown table header."""
+    clean_name = col.replace("_", " ").replace("-", " ").title()
+    if "id" in col.lower():
+        clean_name = clean_name.replace("Id", "ID")
+    return clean_name
+
+
+def iter_gradebook_markdown(
+    df: pd.DataFrame, course_id: str, course_name: str, export_date: str
+) -> Iterator[str]:
+    """Yields the Markdown lines that precede the gradebook table."""
+    yield "# NetAcad Gradebook Export"
+    yield ""
+    yield "## Course Information"
+    yield f"- **Course ID:** {course_id}"
+    yield f"- **Course Name:** {course_name}"
+    yield f"- **Export Date:** {export_date}"
+    yield f"- **Total Students:** {len(df)}"
+    yield ""
+    yield "---"
+    yield ""
 
     # Add summary statistics if numeric columns exist
     numeric_columns = df.select_dtypes(include=["number"]).columns.tolist()
     if len(numeric_columns) > 1:  # More than just COURSE_ID
-        markdown_lines.extend(
-            [
-                "## Grade Summary Statistics",
-                "",
-                "This section provides statistical analysis of student performance across gradeable items.",
-                "",
-            ]
+        yield "## Grade Summary Statistics"
+        yield ""
+        yield "This section provides statistical analysis of student performance across gradeable items."
+        yield ""
+
+        # One aggregation over every numeric column instead of describe() per
+        # column; all-NaN columns have a count of 0 and are skipped
+        stats_df = (
+            df[numeric_columns]
+            .drop(columns=["COURSE_ID"], errors="ignore")
+            .describe()
+            .T
         )
+        for col, stats in stats_df[stats_df["count"] > 0].iterrows():
+            display_name = col.replace("_", " ").replace("-", " ").title()
+            yield f"### {display_name}"
+            yield f"- **Average Score:** {stats['mean']:.2f}"
+            yield f"- **Minimum Score:** {stats['min']:.2f}"
+            yield f"- **Maximum Score:** {stats['max']:.2f}"
+            yield f"- **Standard Deviation:** {stats['std']:.2f}"
+            yield f"- **Students with Grades:** {int(stats['count'])}"
+            yield ""
+
+        yield "---"
+        yield ""
 
-        for col in numeric_columns:
-            if col != "COURSE_ID" and not df[col].empty and not df[col].isna().all():
-                stats = df[col].describe()
-                display_name = col.replace("_", " ").replace("-", " ").title()
-
-                markdown_lines.extend(
-                    [
-                        f"### {display_name}",
-                        (
-                            f"- **Average Score:** {stats['mean']:.2f}"
-                            if "mean" in stats
-                            else ""
-                        ),
-                        (
-                            f"- **Minimum Score:** {stats['min']:.2f}"
-                            if "min" in stats
-                            else ""
-                        ),
-                        (
-                            f"- **Maximum Score:** {stats['max']:.2f}"
-                            if "max" in stats
-                            else ""
-                        ),
-                        (
-                            f"- **Standard Deviation:** {stats['std']:.2f}"
-                            if "std" in stats
-                            else ""
-                        ),
-                        (
-                            f"- **Students with Grades:** {int(stats['count'])}"
-                            if "count" in stats
-                            else ""
-                        ),
-                        "",
-                    ]
-                )
+    # Add the main data table
+    yield "## Complete Student Gradebook Data"
+    yield ""
+    yield "Below is the complete gradebook data for all students in this course."
+    yield "Each row represents one student's performance across all gradeable items."
+    yield ""
 
-        markdown_lines.extend(["---", ""])
 
-    # Add the main data table
-    markdown_lines.extend(
-        [
-            "## Complete Student Gradebook Data",
-            "",
-            "Below is the complete gradebook data for all students in this course.",
-            "Each row represents one student's performance across all gradeable items.",
-            "",
-        ]
+def write_gradebook_markdown(
+    f: TextIO, df: pd.DataFrame, course_id: str, course_name: str
+) -> None:
+    """Writes formatted Markdown for gradebook data, optimized for LLM consumption, to f."""
+    export_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    # Stream the preamble line by line rather than collecting it in a list
+    f.writelines(
+        line + "\n"
+        for line in iter_gradebook_markdown(df, course_id, course_name, export_date)
     )
 
-    # Convert DataFrame to Markdown table
-    display_df = df.copy()
-    column_mapping = {}
-    for col in display_df.columns:
-        clean_name = col.replace("_", " ").replace("-", " ").title()
-        if "id" in col.lower():
-            clean_name = clean_name.replace("Id", "ID")
-        column_mapping[col] = clean_name
+    # Convert DataFrame to Markdown table, prettifying only the header row
+    # instead of copying and renaming the whole DataFrame. Courses share most
+    # column names, so the formatting is cached across exports
+    pretty_headers = [_pretty_column_name(col) for col in df.columns]
 
-    display_df = display_df.rename(columns=column_mapping)
-    markdown_table = display_df.to_markdown(index=False, tablefmt="pipe")
-    markdown_lines.append(markdown_table)
+    # to_markdown builds the whole table string in memory before writing it
+    df.to_markdown(buf=f, index=False, headers=pretty_headers, tablefmt="pipe")
+    f.write("\n")
 
     # Add metadata footer
-    markdown_lines.extend(
-        [
-            "",
-            "---",
-            "",
-            "## Export Metadata",
-            "",
-            f"- **Generated:** {export_date}",
-            f"- **Data Source:** NetAcad Learning Management Platform",
-            f"- **Processing System:** Automated Course Export Tool (Playwright)",
-            f"- **File Format:** Markdown (.md) - Optimized for AI/LLM Processing",
-            f"- **CSV Companion:** Available in separate headerless CSV format",
-            "",
-            "### Data Notes",
-            "- All numeric scores are preserved in original format",
-            "- Missing grades are represented as empty cells or NaN values",
-            "- Course ID has been prepended to maintain data integrity",
-            "- Column headers have been formatted for improved readability",
-        ]
+    f.write(
+        "\n".join(
+            [
+                "",
+                "---",
+                "",
+                "## Export Metadata",
+                "",
+                f"- **Generated:** {export_date}",
+                f"- **Data Source:** NetAcad Learning Management Platform",
+                f"- **Processing System:** Automated Course Export Tool (Playwright)",
+                f"- **File Format:** Markdown (.md) - Optimized for AI/LLM Processing",
+                f"- **CSV Companion:** Available in separate headerless CSV format",
+                "",
+                "### Data Notes",
+                "- All numeric scores are preserved in original format",
+                "- Missing grades are represented as empty cells or NaN values",
+                "- Course ID has been prepended to maintain data integrity",
+                "- Column headers have been formatted for improved readability",
+            ]
+        )
     )
 
-    return "\n".join(markdown_lines)
+
+def read_gradebook_csv(file_path: Path) -> pd.DataFrame:
+    """Reads a gradebook CSV with CSV_ENGINE, retrying with the C engine if it fails."""
+    try:
+        return pd.read_csv(file_path, engine=CSV_ENGINE)
+    except (pd.errors.ParserError, ValueError) as e:
+        # pyarrow.lib.ArrowInvalid subclasses ValueError
+        if CSV_ENGINE == "c":
+            raise
+        logger.warning(
+            "%s could not parse %s (%s); retrying with the C engine",
+            CSV_ENGINE,
+            file_path.name,
+            e,
+        )
+        return pd.read_csv(file_path, engine="c")
 
 
 def add_course_id_to_csv(
@@ -229,13 +276,13 @@ def add_course_id_to_csv(
         return False, "", ""
 
     try:
-        df = pd.read_csv(str(original_file_path))
+        df = read_gradebook_csv(original_file_path)
         df.insert(0, "COURSE_ID", course_id)
 
         # Create organized CSV file (without headers for platform compatibility)
         csv_output_path = CSV_DATA_DIR / csv_filename
-        df.to_csv(str(csv_output_path), index=False, header=False)
-        logger.info(f"CSV file (no headers) saved to: {csv_output_path}")
+        df.to_csv(csv_output_path, index=False, header=False)
+        logger.info("CSV file (no headers) saved to: %s", csv_output_path)
 
         # Create Markdown version (with headers for LLM readability)
         markdown_success, markdown_path = create_markdown_export(
@@ -243,9 +290,9 @@ def add_course_id_to_csv(
         )
 
         if markdown_success:
-            logger.info(f"Successfully processed both formats for {course_name}")
+            logger.info("Successfully processed both formats for %s", course_name)
             original_file_path.unlink()
-            logger.info(f"Cleaned up original download: {original_file_path}")
+            logger.info("Cleaned up original download: %s", original_file_path)
             return True, str(csv_output_path), markdown_path
         else:
             logger.warning(
@@ -258,31 +305,6 @@ def add_course_id_to_csv(
         return False, "", ""
 
 
-async def wait_for_download(download_path: Path, timeout: int = 30) -> str | None:
-    """Waits for a new CSV file to appear in the download directory."""
-    initial_files = set(os.listdir(str(download_path)))
-    start_time = asyncio.get_event_loop().time()
-
-    while True:
-        current_files = set(os.listdir(str(download_path)))
-        new_files = current_files - initial_files
-        csv_files = [file for file in new_files if file.endswith(".csv")]
-
-        if csv_files:
-            latest_csv = max(
-                csv_files,
-                key=lambda f: os.path.getctime(os.path.join(download_path, f)),
-            )
-            logger.info(f"Download complete: {latest_csv}")
-            return latest_csv
-
-        if asyncio.get_event_loop().time() - start_time > timeout:
-            logger.warning("Download timeout reached.")
-            return None
-
-        await asyncio.sleep(0.5)  # Check every 500ms
-
-
 async def navigate_to_login(page: Page):
     """Navigate to the login page and click the login button."""
     try:
@@ -320,57 +342,63 @@ async def send_credentials(page: Page):
         raise
 
 
-async def paginate_and_fetch_courses(page: Page) -> Tuple[List[str], List[str]]:
-    """Cycles through all pages and collects course URLs and names."""
-    course_urls = []
-    course_names = []
-    page_num = 0
+# Cookies from the last successful login, shared by every run and context
+AUTH_STATE_PATH = DATA_DIR / "auth.json"
 
-    while True:
-        page_num += 1
-        logger.info(f"My Classlist Page {page_num}")
-
-        # Wait for course anchors to load
-        await page.wait_for_selector(".instance_name--dioD1", timeout=15000)
 
-        # Collect course anchors on the current page
-        course_anchors = await page.locator(".instance_name--dioD1").all()
+def save_auth_state(state: dict) -> None:
+    """Writes the session cookies to AUTH_STATE_PATH, readable by the owner only."""
+    fd = os.open(AUTH_STATE_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    # O_CREAT's mode only applies to new files; tighten one left by an older run
+    os.chmod(AUTH_STATE_PATH, 0o600)
 
-        for anchor in course_anchors:
-            href = await anchor.get_attribute("href")
-            text = await anchor.text_content()
-            if href and text:
-                course_urls.append(f"{BASE_URL}{href}")
-                course_names.append(text.strip())
 
-        # Try to find and click the next button
+async def open_logged_in_page(
+    browser: Browser, block_resources: bool = False, **context_options
+) -> tuple[BrowserContext, Page]:
+    """Opens a page on the course list, reusing the saved session when it is still valid."""
+    if AUTH_STATE_PATH.exists():
+        context = await browser.new_context(
+            storage_state=AUTH_STATE_PATH, **context_options
+        )
+        if block_resources:
+            await context.route("**/*", abort_heavy_resources)
+        page = await context.new_page()
         try:
-            next_button = page.locator(
-                "button.pageItem--BNJmT.sides--EdMyh span.icon-chevron-right"
-            )
+            await page.goto(BASE_URL, wait_until="domcontentloaded", timeout=30000)
+            await page.wait_for_selector(".instance_name--dioD1", timeout=10000)
+            logger.info("Reused saved login session.")
+            return context, page
+        except PlaywrightTimeoutError:
+            logger.info("Saved login session expired, logging in again.")
+            await context.close()
 
-            # Check if next button exists and is enabled
-            if await next_button.count() > 0:
-                parent_button = next_button.locator("..")
-                is_disabled = await parent_button.get_attribute("disabled")
+    context = await browser.new_context(**context_options)
+    if block_resources:
+        await context.route("**/*", abort_heavy_resources)
+    page = await context.new_page()
+    await page.goto(BASE_URL, wait_until="domcontentloaded", timeout=30000)
+    await navigate_to_login(page)
+    await send_credentials(page)
+    save_auth_state(await context.storage_state())
+    return context, page
 
-                if is_disabled:
-                    logger.info("Next button is disabled. Exiting pagination loop.")
-                    break
 
-                await parent_button.click()
-                await page.wait_for_load_state("networkidle", timeout=10000)
-            else:
-                logger.info("No next button found. Exiting pagination loop.")
-                break
+# [href, text] for each course anchor; href is the raw attribute (a relative path)
+COURSE_ANCHOR_PAIRS_JS = (
+    "anchors => anchors.map(a => [a.getAttribute('href'), a.textContent])"
+)
 
-        except Exception as e:
-            logger.info(f"Pagination complete or error: {e}")
-            break
 
-    logger.info(f"Total course names collected: {len(course_names)}")
-    logger.info(f"Total course URLs collected: {len(course_urls)}")
-    return course_urls, course_names
+# Clicks the first entry of the open export list; false when the list is empty
+CLICK_FIRST_EXPORT_LINK_JS = """() => {
+    const link = document.querySelector('.dropdown-item.dropdownItem--gyPVf');
+    if (!link) return false;
+    link.click();
+    return true;
+}"""
 
 
 async def execute_gradebook_actions(
@@ -378,21 +406,22 @@ async def execute_gradebook_actions(
 ) -> tuple[bool, str, str]:
     """Execute gradebook export actions for a single course."""
     try:
-        logger.info(f"Starting gradebook actions for Course ID: {course_id}")
+        logger.info("Starting gradebook actions for Course ID: %s", course_id)
 
         # Click gradebook tab
         gradebook_tab = page.locator("#Launch-tab-gradebook")
         await gradebook_tab.click()
-        await page.wait_for_load_state("networkidle", timeout=15000)
+        # Wait for the control used next rather than for network silence
+        await page.wait_for_selector("button.iconDownload--RKrnV", timeout=15000)
 
         # Click export dropdown - target the Download button specifically
         logger.info("Clicking export dropdown...")
         export_dropdown = page.locator("button.iconDownload--RKrnV")
         await export_dropdown.click()
-        await asyncio.sleep(0.5)  # Brief pause for dropdown animation
 
-        # Click "Export All"
+        # Click "Export All" once the dropdown animation has rendered it
         export_all_btn = page.locator(".dropdownButton--whS7t").first
+        await export_all_btn.wait_for(state="visible", timeout=5000)
         await export_all_btn.click()
 
         # Wait for and handle the export confirmation modal
@@ -403,48 +432,40 @@ async def execute_gradebook_actions(
             )
             logger.info("Export modal appeared, looking for close/OK button...")
 
-            # Try multiple strategies to close the modal
-            closed = False
+            # Race every known close control in one locator, so a miss on the
+            # primary button doesn't cost a full timeout before the X is tried
+            modal = page.locator(".exportCsvModal--XL37A")
+            close_target = (
+                modal.locator(
+                    "button.btn--primary, "
+                    "button[type='button']:has-text('Okay'), "
+                    "button:has-text('Close'), "
+                    ".modal__footer button"
+                )
+                .or_(
+                    modal.locator(
+                        "button.close, [aria-label='Close'], .modal-header button"
+                    )
+                )
+                .first
+            )
 
-            # Strategy 1: Look for OK/Close button within the modal
+            closed = False
             try:
-                # Common button patterns in modals
-                modal_button = page.locator(
-                    ".exportCsvModal--XL37A button.btn--primary, "
-                    ".exportCsvModal--XL37A button[type='button']:has-text('Okay'), "
-                    ".exportCsvModal--XL37A button:has-text('Close'), "
-                    ".exportCsvModal--XL37A .modal__footer button"
-                ).first
-
-                await modal_button.click(timeout=3000)
-                logger.info("Clicked modal button.")
+                await close_target.click(timeout=3000)
+                logger.info("Clicked modal close button.")
                 closed = True
             except Exception as e:
-                logger.warning(f"Modal button click failed: {e}")
+                logger.warning("Modal close button click failed: %s", e)
 
-            # Strategy 2: Click X button or aria-label close
-            if not closed:
-                try:
-                    close_btn = page.locator(
-                        ".exportCsvModal--XL37A button.close, "
-                        ".exportCsvModal--XL37A [aria-label='Close'], "
-                        ".exportCsvModal--XL37A .modal-header button"
-                    ).first
-
-                    await close_btn.click(timeout=3000)
-                    logger.info("Clicked close button.")
-                    closed = True
-                except Exception as e:
-                    logger.warning(f"Close button click failed: {e}")
-
-            # Strategy 3: Press Escape key
+            # Fall back to the Escape key
             if not closed:
                 try:
                     await page.keyboard.press("Escape")
                     logger.info("Pressed Escape to close modal.")
                     closed = True
                 except Exception as e:
-                    logger.warning(f"Escape key failed: {e}")
+                    logger.warning("Escape key failed: %s", e)
 
             # Wait for modal to disappear
             if closed:
@@ -456,7 +477,7 @@ async def execute_gradebook_actions(
                 logger.warning("Could not close modal with any strategy.")
 
         except Exception as e:
-            logger.warning(f"Modal handling error: {e}")
+            logger.warning("Modal handling error: %s", e)
 
         # Click refresh button
         refresh_btn = page.locator("#refreshExportList")
@@ -478,7 +499,7 @@ async def execute_gradebook_actions(
                 success = True
                 break
             except Exception as e:
-                logger.warning(f"Attempt {attempt + 1}/3 failed: {e}")
+                logger.warning("Attempt %d/3 failed: %s", attempt + 1, e)
                 if attempt < 2:
                     await asyncio.sleep(1)
 
@@ -486,41 +507,46 @@ async def execute_gradebook_actions(
             logger.error("Failed to open dropdown after 3 attempts.")
             return False, "", ""
 
-        # Click the first export link
-        export_links = page.locator(".dropdown-item.dropdownItem--gyPVf")
-        if await export_links.count() > 0:
-            first_link = export_links.first
-            await first_link.click()
-
-            # Wait for download
-            csv_filename = await wait_for_download(DATA_DIR, timeout=30)
+        # Click the first export link. The dropdown is already open, so find and
+        # click it in one in-page call instead of count() + click() round-trips
+        csv_filename = None
+        try:
+            async with page.expect_download(timeout=30_000) as download_info:
+                if not await page.evaluate(CLICK_FIRST_EXPORT_LINK_JS):
+                    # Raising cancels the pending download wait
+                    raise LookupError("No export links found.")
+            download = await download_info.value
+            csv_filename = download.suggested_filename
+            await download.save_as(DATA_DIR / csv_filename)
+            logger.info("Download complete: %s", csv_filename)
+        except LookupError as e:
+            logger.error(str(e))
+            return False, "", ""
+        except PlaywrightTimeoutError:
+            logger.warning("Download timeout reached.")
 
-            if csv_filename:
-                logger.info(f"Downloaded file: {csv_filename}")
+        if csv_filename:
+            logger.info("Downloaded file: %s", csv_filename)
 
-                # Process the file
-                success, csv_path, markdown_path = add_course_id_to_csv(
-                    csv_filename, course_id, course_name
-                )
+            # Process the file on a worker thread so the other course
+            # workers keep driving their pages meanwhile
+            success, csv_path, markdown_path = await asyncio.to_thread(
+                add_course_id_to_csv, csv_filename, course_id, course_name
+            )
 
-                if success:
-                    logger.info(
-                        f"Successfully processed both formats for {course_name}"
-                    )
-                    return True, csv_path, markdown_path
-                else:
-                    logger.error(f"Failed to process files for course {course_id}")
-                    return False, "", ""
+            if success:
+                logger.info("Successfully processed both formats for %s", course_name)
+                return True, csv_path, markdown_path
             else:
-                logger.error("Download timeout or failed.")
+                logger.error("Failed to process files for course %s", course_id)
                 return False, "", ""
         else:
-            logger.error("No export links found.")
+            logger.error("Download timeout or failed.")
             return False, "", ""
 
     except Exception as e:
         logger.error(
-            f"Error executing gradebook actions for {course_id}: {e}", exc_info=True
+            "Error executing gradebook actions for %s: %s", course_id, e, exc_info=True
         )
         return False, "", ""
 
@@ -534,19 +560,20 @@ async def collect_course_data(page: Page) -> Tuple[List[str], List[str], List[st
 
     while True:
         page_num += 1
-        logger.info(f"My Classlist Page {page_num}")
+        logger.info("My Classlist Page %d", page_num)
 
         # Wait for course anchors to load
         await page.wait_for_selector(".instance_name--dioD1", timeout=15000)
 
-        # Collect course anchors on the current page
-        course_anchors = await page.locator(".instance_name--dioD1").all()
+        # Read every anchor's href and text in one round-trip
+        anchor_pairs = await page.locator(".instance_name--dioD1").evaluate_all(
+            COURSE_ANCHOR_PAIRS_JS
+        )
 
-        for anchor in course_anchors:
-            href = await anchor.get_attribute("href")
-            text = await anchor.text_content()
+        for href, text in anchor_pairs:
             if href and text:
-                course_ids.append(href.split("=")[1].strip())
+                course_id = href.partition("=")[2].strip()
+                course_ids.append(course_id or f"unknown_{len(course_ids)}")
                 course_urls.append(f"{BASE_URL}{href}")
                 course_names.append(text.strip())
 
@@ -596,18 +623,11 @@ async def get_course_data():
                 "--disable-dev-shm-usage",
             ],
         )  # debug headless=false
-        # Create context with download path
-        context = await browser.new_context(accept_downloads=True)
-
-        # Create page
-        page = await context.new_page()
+        context = None
 
         try:
             logger.info("Navigating to netacad.com...")
-            # Use domcontentloaded instead of networkidle for faster, more reliable loading
-            await page.goto(BASE_URL, wait_until="domcontentloaded", timeout=30000)
-            await navigate_to_login(page)
-            await send_credentials(page)
+            context, page = await open_logged_in_page(browser, accept_downloads=True)
 
             course_ids, course_urls, course_names = await collect_course_data(page)
 
@@ -615,7 +635,8 @@ async def get_course_data():
             logger.error(f"Error in main processing loop: {e}", exc_info=True)
 
         finally:
-            await context.close()
+            if context is not None:
+                await context.close()
             await browser.close()
 
     return course_ids, course_urls, course_names
@@ -623,7 +644,7 @@ async def get_course_data():
 
 async def process_courses(clear_downloads: bool = True):
     """Main function to process all courses using Playwright."""
-    start_time = asyncio.get_event_loop().time()
+    start_time = time.monotonic()
 
     if clear_downloads:
         logger.info("Clearing old downloads...")
@@ -632,7 +653,7 @@ async def process_courses(clear_downloads: bool = True):
     # Initialize results tracking
     course_ids = []
     course_names_list = []
-    course_csv_files = []
+    course_csv_files: List[Tuple[str, str]] = []
     failed_course_ids = []
 
     async with async_playwright() as p:
@@ -647,86 +668,115 @@ async def process_courses(clear_downloads: bool = True):
             ],
         )
 
-        # Create context with download path
-        context = await browser.new_context(
-            accept_downloads=True,
-            viewport={"width": 1920, "height": 1080},
-        )
-
-        # Set default timeout
-        context.set_default_timeout(WEBDRIVER_TIMEOUT * 1000)
-
-        # Create page
-        page = await context.new_page()
+        context = None
 
         try:
-            # Navigate and login
+            # Navigate and login, skipping images, fonts and media; stylesheets
+            # stay for the class selectors
             logger.info("Navigating to netacad.com...")
-            await page.goto(BASE_URL, wait_until="networkidle")
+            context, page = await open_logged_in_page(
+                browser,
+                block_resources=True,
+                accept_downloads=True,
+                viewport={"width": 1920, "height": 1080},
+            )
 
-            await navigate_to_login(page)
-            await send_credentials(page)
+            # Set default timeout
+            context.set_default_timeout(WEBDRIVER_TIMEOUT * 1000)
 
-            # Fetch all courses
-            course_urls, course_names = await paginate_and_fetch_courses(page)
+            # Fetch all courses; ids are parsed once while paginating
+            all_course_ids, course_urls, course_names = await collect_course_data(page)
 
-            # Process each course
-            for i, url in enumerate(course_urls):
-                if url:
-                    course_name = course_names[i]
-                    course_id = url.split("=")[1] if "=" in url else f"unknown_{i}"
+            # Sibling contexts reuse this session instead of logging in again
+            storage_state = await context.storage_state()
+            semaphore = asyncio.Semaphore(MAX_WORKERS)
 
+            async def process_one(
+                i: int, course_id: str, url: str, course_name: str
+            ) -> tuple[str, str, tuple[str, str]]:
+                """Exports one course in its own context; returns (id, name, (csv, md))."""
+                async with semaphore:
                     logger.info(
-                        f"Processing course {i + 1}/{len(course_urls)}: {course_name}"
+                        "Processing course %d/%d: %s",
+                        i + 1,
+                        len(course_urls),
+                        course_name,
                     )
+                    logger.info("Course URL: %s", url)
 
-                    course_ids.append(course_id)
-                    course_names_list.append(course_name)
-                    logger.info(f"Course URL: {url}")
+                    course_context = await browser.new_context(
+                        accept_downloads=True,
+                        viewport={"width": 1920, "height": 1080},
+                        storage_state=storage_state,
+                    )
+                    await course_context.route("**/*", abort_heavy_resources)
+                    course_context.set_default_timeout(WEBDRIVER_TIMEOUT * 1000)
 
                     try:
+                        course_page = await course_context.new_page()
                         # Navigate to course page
-                        await page.goto(
+                        await course_page.goto(
                             url, wait_until="domcontentloaded", timeout=30000
                         )
 
                         # Execute gradebook export
                         success, csv_path, md_path = await execute_gradebook_actions(
-                            page, course_id, course_name
+                            course_page, course_id, course_name
                         )
 
                         if success:
-                            course_csv_files.append(f"CSV: {csv_path} | MD: {md_path}")
                             logger.info(
-                                f"[SUCCESS] Successfully exported grades for {course_name}"
-                            )
-                        else:
-                            course_csv_files.append("")
-                            failed_course_ids.append(course_id)
-                            logger.warning(
-                                f"[FAILED] Failed to export grades for {course_name}"
+                                "[SUCCESS] Successfully exported grades for %s",
+                                course_name,
                             )
+                            return course_id, course_name, (csv_path, md_path)
+
+                        logger.warning(
+                            "[FAILED] Failed to export grades for %s", course_name
+                        )
 
                     except Exception as e:
                         logger.error(
-                            f"[ERROR] Unexpected error processing {course_name}: {e}"
+                            "[ERROR] Unexpected error processing %s: %s",
+                            course_name,
+                            e,
                         )
-                        course_csv_files.append("")
-                        failed_course_ids.append(course_id)
 
-                    logger.info("-" * 50)
+                    finally:
+                        await course_context.close()
+
+                return course_id, course_name, ("", "")
+
+            # Export courses concurrently, at most MAX_WORKERS at a time;
+            # gather keeps the results in course order
+            results = await asyncio.gather(
+                *(
+                    process_one(i, course_id, url, course_name)
+                    for i, (course_id, url, course_name) in enumerate(
+                        zip(all_course_ids, course_urls, course_names)
+                    )
+                )
+            )
+
+            for course_id, course_name, export_paths in results:
+                course_ids.append(course_id)
+                course_names_list.append(course_name)
+                course_csv_files.append(export_paths)
+                if not export_paths[0]:
+                    failed_course_ids.append(course_id)
 
         finally:
-            await context.close()
+            if context is not None:
+                await context.close()
             await browser.close()
 
     # Save summary
     save_courses_data_to_json(course_ids, course_names_list, course_csv_files)
 
     # Print summary
-    successful_exports = sum(1 for file_info in course_csv_files if file_info)
+    successful_exports = sum(1 for csv_path, _ in course_csv_files if csv_path)
     failed_exports = len(course_ids) - successful_exports
-    elapsed_time = asyncio.get_event_loop().time() - start_time
+    elapsed_time = time.monotonic() - start_time
 
     logger.info("=" * 60)
     logger.info("EXPORT SUMMARY")
@@ -745,35 +795,33 @@ async def process_courses(clear_downloads: bool = True):
 
 
 def save_courses_data_to_json(
-    course_ids: List[str], course_names: List[str], course_csv_files: List[str]
+    course_ids: List[str],
+    course_names: List[str],
+    course_csv_files: List[Tuple[str, str]],
 ):
     """Save course processing results to JSON with file path information."""
-    course_data = []
-
-    for i, (course_id, course_name) in enumerate(zip(course_ids, course_names)):
-        file_info = course_csv_files[i] if i < len(course_csv_files) else ""
-
-        csv_path = ""
-        markdown_path = ""
-
-        if file_info and " | " in file_info:
-            parts = file_info.split(" | ")
-            csv_path = parts[0].replace("CSV: ", "") if len(parts) > 0 else ""
-            markdown_path = parts[1].replace("MD: ", "") if len(parts) > 1 else ""
-
-        course_data.append(
-            {
-                "course_id": course_id,
-                "course_name": course_name,
-                "csv_file_path": csv_path,
-                "markdown_file_path": markdown_path,
-                "processing_status": "success" if file_info else "failed",
-            }
+    course_data = [
+        {
+            "course_id": course_id,
+            "course_name": course_name,
+            "csv_file_path": csv_path,
+            "markdown_file_path": markdown_path,
+            "processing_status": "success" if csv_path else "failed",
+        }
+        for course_id, course_name, (csv_path, markdown_path) in zip(
+            course_ids, course_names, course_csv_files
         )
+    ]
 
-    df = pd.DataFrame(course_data)
     json_path = DATA_DIR / "courses_export_summary.json"
-    df.to_json(str(json_path), orient="records", indent=4)
+    if orjson is not None:
+        # orjson serializes straight to bytes, skipping the DataFrame round-trip
+        json_path.write_bytes(orjson.dumps(course_data, option=orjson.OPT_INDENT_2))
+    else:
+        # Encode in one go; json.dump issues a write per encoder chunk
+        json_path.write_text(
+            json.dumps(course_data, indent=2, ensure_ascii=False), encoding="utf-8"
+        )
     logger.info(f"Course export summary saved to: {json_path}")
 
 
@@ -4,11 +4,18 @@ Demo script to show the improved JSON logging and summary features.
 """
 
 import json
+import mmap
+import sys
 from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from course_export_optimized import (
     save_courses_data_to_json,
     _all_course_results,
-    _results_lock,
 )
 
 
@@ -45,10 +52,10 @@ def demo_improved_logging():
         },
     ]
 
-    # Add sample results to the global list
+    # Add sample results to the global list; a single extend is atomic under
+    # the GIL for both list and deque, so no lock is needed
     global _all_course_results
-    with _results_lock:
-        _all_course_results.extend(sample_results)
+    _all_course_results.extend(sample_results)
 
     print("📝 Generating sample export summary with failures...")
     save_courses_data_to_json()
@@ -59,25 +66,35 @@ def demo_improved_logging():
         print(f"\n📄 Sample JSON Summary Structure:")
         print("-" * 30)
 
-        with open(json_path, "r") as f:
-            data = json.load(f)
+        if orjson is not None:
+            # Parse straight from the mapped file instead of reading a copy
+            with open(json_path, "rb") as f, mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_READ
+            ) as mm, memoryview(mm) as view:
+                data = orjson.loads(view)
+        else:
+            with open(json_path, "r") as f:
+                data = json.load(f)
 
         print("Summary Section:")
         for key, value in data["summary"].items():
             print(f"  {key}: {value}")
 
-        print(f"\nCourse Details ({len(data['courses'])} courses):")
+        # Collect each listing and write it once rather than print per course
+        lines = [f"\nCourse Details ({len(data['courses'])} courses):"]
         for course in data["courses"]:
             status = "✅" if course["success"] else "❌"
-            print(f"  {status} {course['course_name']} ({course['course_id']})")
+            lines.append(f"  {status} {course['course_name']} ({course['course_id']})")
             if not course["success"]:
-                print(f"      Error: {course.get('error_message', 'Unknown')}")
+                lines.append(f"      Error: {course.get('error_message', 'Unknown')}")
+        sys.stdout.write("\n".join(lines) + "\n")
 
-        print(
+        lines = [
             f"\nFailed Courses Summary ({len(data['failed_course_details'])} failures):"
-        )
+        ]
         for failure in data["failed_course_details"]:
-            print(f"  ❌ {failure['course_name']}: {failure['error']}")
+            lines.append(f"  ❌ {failure['course_name']}: {failure['error']}")
+        sys.stdout.write("\n".join(lines) + "\n")
 
         print(f"\n📊 Success Rate: {data['summary']['success_rate_percentage']}%")
 
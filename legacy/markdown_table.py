@@ -0,0 +1,48 @@
+from typing import List, TextIO
+
+import pandas as pd
+
+
+def escape_markdown_cell(value: object) -> str:
+    """Escapes pipes and flattens line breaks so a value stays in its table cell."""
+    return (
+        str(value)
+        .replace("|", "\\|")
+        .replace("\r\n", " ")
+        .replace("\r", " ")
+        .replace("\n", " ")
+    )
+
+
+def write_markdown_table(
+    f: TextIO,
+    df: pd.DataFrame,
+    headers: List[str] | None = None,
+    chunk_size: int = 1000,
+) -> None:
+    """
+    Writes a DataFrame as a pipe-style Markdown table.
+
+    Rows are formatted from a pre-built row template and written in chunks, so
+    the full table is never materialized as one string and tabulate's per-cell
+    formatting is skipped; pipe tables do not need padded column widths.
+    Missing values are written as empty cells.
+
+    Args:
+        f: Text file to write to
+        df: DataFrame to render
+        headers: Display headers (defaults to the DataFrame's column names)
+        chunk_size: Number of rows converted and written per batch
+    """
+    if headers is None:
+        headers = [str(col) for col in df.columns]
+
+    f.write("| " + " | ".join(map(escape_markdown_cell, headers)) + " |\n")
+    f.write("|" + "|".join("---" for _ in headers) + "|\n")
+
+    row_template = "| " + " | ".join("{}" for _ in headers) + " |\n"
+    for start in range(0, len(df), chunk_size):
+        rows = df.iloc[start : start + chunk_size].to_numpy(dtype=object, na_value="")
+        f.writelines(
+            row_template.format(*map(escape_markdown_cell, row)) for row in rows
+        )
@@ -0,0 +1,55 @@
+"""
+Tests for the legacy scraper's Markdown table writer.
+"""
+
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "legacy"))
+
+pd = pytest.importorskip("pandas")
+markdown_table = pytest.importorskip("markdown_table")
+
+
+def render(df, **kwargs):
+    """Renders a DataFrame through write_markdown_table and returns the text."""
+    buf = io.StringIO()
+    markdown_table.write_markdown_table(buf, df, **kwargs)
+    return buf.getvalue()
+
+
+def test_header_and_separator():
+    """The header row uses the given display names, followed by the separator."""
+    df = pd.DataFrame({"a": [1], "b": [2]})
+    lines = render(df, headers=["Name", "Score"]).splitlines()
+    assert lines[0] == "| Name | Score |"
+    assert lines[1] == "|---|---|"
+    assert lines[2] == "| 1 | 2 |"
+
+
+def test_missing_values_are_empty_cells():
+    """NaN and None are written as empty cells."""
+    df = pd.DataFrame({"a": [1.5, float("nan")], "b": ["x", None]})
+    lines = render(df).splitlines()
+    assert lines[0] == "| a | b |"
+    assert lines[2] == "| 1.5 | x |"
+    assert lines[3] == "|  |  |"
+
+
+def test_cells_are_escaped():
+    """Pipes are escaped and line breaks flattened so rows stay intact."""
+    df = pd.DataFrame({"a|b": ["x|y"], "c": ["line1\r\nline2\nline3\rend"]})
+    lines = render(df).splitlines()
+    assert len(lines) == 3
+    assert lines[0] == "| a\\|b | c |"
+    assert lines[2] == "| x\\|y | line1 line2 line3 end |"
+
+
+def test_rows_written_across_chunks():
+    """Every row is written when the frame spans several chunks."""
+    df = pd.DataFrame({"n": range(5)})
+    lines = render(df, chunk_size=2).splitlines()
+    assert lines[2:] == [f"| {n} |" for n in range(5)]